@@ -0,0 +1 @@
+"""Offline performance benchmarks for end-to-end tool calls (see ``python -m benchmarks.run --help``)."""
@@ -0,0 +1,309 @@
+"""
+Measurement and baseline comparison for the benchmark suite
+
+For each scenario the harness runs a few unmeasured warm-up iterations, then:
+
+- a sequential pass timing every iteration (latency percentiles) and
+  averaging the per-phase ``timings`` the server attaches to tool results
+- a short pass under ``tracemalloc`` recording the peak memory each
+  iteration allocates
+- a concurrent pass (``concurrency`` iterations in flight) for throughput
+
+Reports are plain JSON.  :func:`compare` checks a report against a stored
+baseline: a metric regresses when it is worse by more than its relative
+threshold *and* by more than a small absolute noise floor.
+"""
+
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Optional
+
+from benchmarks.scenarios import Scenario
+from benchmarks.transport import BenchmarkTransport, use_transport
+
+BASELINE_VERSION = 1
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# metric -> (relative threshold, absolute noise floor, higher_is_better)
+DEFAULT_THRESHOLDS: dict[str, tuple[float, float, bool]] = {
+    "latency_ms.p50": (0.50, 5.0, False),
+    "latency_ms.p95": (1.00, 10.0, False),
+    "peak_alloc_kb": (0.25, 256.0, False),
+    "throughput_per_s": (0.40, 0.0, True),
+}
+
+# The server reads these at import time, so they are set before anything imports it
+BENCHMARK_ENVIRONMENT = {
+    "ZEN_MCP_FORCE_ENV_OVERRIDE": "false",
+    "OPENAI_API_KEY": "benchmark-replay-key",
+    "DEFAULT_MODEL": "gpt-5.4",
+    "MAX_CONVERSATION_TURNS": "200",
+    "BACKGROUND_JOBS": "false",
+    "TOOL_TIMINGS": "true",
+    "ZEN_STDIO_SILENT": "1",
+}
+CLEARED_ENVIRONMENT = (
+    "GEMINI_API_KEY",
+    "XAI_API_KEY",
+    "OPENROUTER_API_KEY",
+    "DIAL_API_KEY",
+    "AZURE_OPENAI_API_KEY",
+    "CUSTOM_API_URL",
+    "OPENAI_ALLOWED_MODELS",
+    "PROFILE_TOOLS",
+    "TRACE_EXPORT_PATH",
+    "RESPONSE_CACHE_TOOLS",
+)
+
+
+def prepare_environment() -> None:
+    """Point the server at the offline transport's OpenAI provider only; call before importing ``server``."""
+    import utils.env as env_config
+
+    env_config.reload_env({"ZEN_MCP_FORCE_ENV_OVERRIDE": "false"})
+    os.environ.setdefault("LOG_LEVEL", "INFO")
+    os.environ.update(BENCHMARK_ENVIRONMENT)
+    for name in CLEARED_ENVIRONMENT:
+        os.environ.pop(name, None)
+
+
+def configure_server() -> None:
+    """Register providers the way the server does at startup."""
+    import server
+    from providers.registry import ModelProviderRegistry
+
+    ModelProviderRegistry.reset_for_testing()
+    server.configure_providers()
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Linear-interpolated percentile of ``values`` (``fraction`` in 0..1)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _result_payloads(results: list) -> list[dict[str, Any]]:
+    payloads = []
+    for result in results:
+        try:
+            payload = json.loads(result[0].text)
+        except (IndexError, AttributeError, ValueError):
+            payload = {"status": "unparseable"}
+        payloads.append(payload if isinstance(payload, dict) else {"status": "unparseable"})
+    return payloads
+
+
+def _is_error(payload: dict[str, Any]) -> bool:
+    return payload.get("status") in ("error", "unparseable")
+
+
+async def _measure(
+    scenario: Scenario, next_arguments, iterations: int, warmup: int, concurrency: int, allocation_iterations: int
+) -> dict[str, Any]:
+    errors: list[str] = []
+
+    async def run_once(arguments) -> list[dict[str, Any]]:
+        payloads = _result_payloads(await scenario.run(arguments))
+        errors.extend(str(payload.get("content", payload))[:300] for payload in payloads if _is_error(payload))
+        return payloads
+
+    for _ in range(warmup):
+        await run_once(next_arguments())
+
+    # Sequential pass: latency and phases
+    latencies = []
+    phase_totals: dict[str, float] = defaultdict(float)
+    for _ in range(iterations):
+        arguments = next_arguments()
+        started = time.perf_counter()
+        payloads = await run_once(arguments)
+        latencies.append((time.perf_counter() - started) * 1000)
+        for payload in payloads:
+            for phase, milliseconds in (payload.get("metadata") or {}).get("timings", {}).items():
+                phase_totals[phase] += milliseconds
+
+    # Allocation pass
+    peaks = []
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        for _ in range(allocation_iterations):
+            arguments = next_arguments()
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await run_once(arguments)
+            peaks.append((tracemalloc.get_traced_memory()[1] - current) / 1024)
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    # Concurrent pass: throughput
+    batch = [next_arguments() for _ in range(iterations)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(arguments):
+        async with semaphore:
+            await run_once(arguments)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited(arguments) for arguments in batch))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "description": scenario.description,
+        "iterations": iterations,
+        "tool_calls_per_iteration": scenario.tool_calls,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 3),
+            "p50": round(percentile(latencies, 0.50), 3),
+            "p95": round(percentile(latencies, 0.95), 3),
+            "max": round(max(latencies), 3),
+        },
+        "phases_ms": {phase: round(total / iterations, 3) for phase, total in sorted(phase_totals.items())},
+        "peak_alloc_kb": round(sum(peaks) / len(peaks), 1) if peaks else None,
+        "throughput_per_s": round(iterations / elapsed, 2) if elapsed > 0 else None,
+        "concurrency": concurrency,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+    }
+
+
+def run_scenario(
+    scenario: Scenario,
+    workspace: Path,
+    iterations: int = 20,
+    warmup: int = 2,
+    concurrency: int = 4,
+    allocation_iterations: int = 5,
+    transport: Optional[BenchmarkTransport] = None,
+) -> dict[str, Any]:
+    """Measure one scenario; ``workspace`` holds the files its tool calls read."""
+    transport = transport or BenchmarkTransport()
+    next_arguments = scenario.setup(workspace)
+    with use_transport(transport):
+        result = asyncio.run(
+            _measure(scenario, next_arguments, iterations, warmup, concurrency, min(allocation_iterations, iterations))
+        )
+    result["provider_responses"] = dict(transport.served)
+    transport.served.clear()
+    return result
+
+
+def environment_info() -> dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": sys.implementation.name,
+        "system": platform.system(),
+        "machine": platform.machine(),
+    }
+
+
+def thresholds_to_json(thresholds: dict[str, tuple[float, float, bool]]) -> dict[str, dict[str, Any]]:
+    return {
+        metric: {"relative": relative, "absolute": absolute, "higher_is_better": higher_is_better}
+        for metric, (relative, absolute, higher_is_better) in thresholds.items()
+    }
+
+
+def build_report(results: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "version": BASELINE_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": environment_info(),
+        "scenarios": results,
+    }
+
+
+def _metric(values: dict[str, Any], path: str) -> Optional[float]:
+    for key in path.split("."):
+        if not isinstance(values, dict) or values.get(key) is None:
+            return None
+        values = values[key]
+    return float(values)
+
+
+def load_thresholds(baseline: dict[str, Any]) -> dict[str, tuple[float, float, bool]]:
+    """Default thresholds, overridden by the baseline's ``thresholds`` (``{metric: {relative, absolute}}``)."""
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for metric, override in (baseline.get("thresholds") or {}).items():
+        relative, absolute, higher_is_better = thresholds.get(metric, (0.25, 0.0, False))
+        thresholds[metric] = (
+            float(override.get("relative", relative)),
+            float(override.get("absolute", absolute)),
+            bool(override.get("higher_is_better", higher_is_better)),
+        )
+    return thresholds
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any]) -> list[dict[str, Any]]:
+    """Regressions of ``report`` against ``baseline``; scenarios missing from either side are skipped."""
+    thresholds = load_thresholds(baseline)
+    regressions = []
+    for name, current in report.get("scenarios", {}).items():
+        if current.get("errors"):
+            regressions.append({"scenario": name, "metric": "errors", "baseline": 0, "current": current["errors"]})
+        previous = (baseline.get("scenarios") or {}).get(name)
+        if previous is None:
+            continue
+        for metric, (relative, absolute, higher_is_better) in thresholds.items():
+            before = _metric(previous, metric)
+            after = _metric(current, metric)
+            if before is None or after is None:
+                continue
+            worse_by = before - after if higher_is_better else after - before
+            if worse_by > absolute and worse_by > relative * abs(before):
+                regressions.append(
+                    {
+                        "scenario": name,
+                        "metric": metric,
+                        "baseline": before,
+                        "current": after,
+                        "change": round(worse_by / before, 3) if before else None,
+                        "threshold": relative,
+                    }
+                )
+    return regressions
+
+
+def format_report(report: dict[str, Any], regressions: Optional[list[dict[str, Any]]] = None) -> str:
+    """Human-readable summary: one row per scenario, its slowest phases and any regressions."""
+    lines = [f"{'scenario':<20} {'p50 ms':>9} {'p95 ms':>9} {'peak KB':>9} {'calls/s':>9}  errors"]
+    for name, result in report["scenarios"].items():
+        latency = result["latency_ms"]
+        lines.append(
+            f"{name:<20} {latency['p50']:>9.1f} {latency['p95']:>9.1f} "
+            f"{result['peak_alloc_kb'] or 0:>9.0f} {result['throughput_per_s'] or 0:>9.1f}  {result['errors']}"
+        )
+        phases = sorted(
+            ((phase, ms) for phase, ms in result["phases_ms"].items() if phase != "handle_call_tool"),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:5]
+        if phases:
+            lines.append("    " + ", ".join(f"{phase} {ms:.1f}" for phase, ms in phases))
+    if regressions is not None:
+        if regressions:
+            lines.append("")
+            lines.append("Regressions:")
+            for regression in regressions:
+                lines.append(
+                    f"  {regression['scenario']}: {regression['metric']} "
+                    f"{regression['baseline']} -> {regression['current']}"
+                )
+        else:
+            lines.append("")
+            lines.append("No regressions against the baseline.")
+    return "\n".join(lines)
@@ -0,0 +1,98 @@
+"""
+Run the offline benchmark suite
+
+    python -m benchmarks.run                              # all scenarios, compared with benchmarks/baseline.json
+    python -m benchmarks.run -s chat -s continuation_50   # selected scenarios
+    python -m benchmarks.run --update-baseline            # record a new baseline
+    python -m benchmarks.run --output report.json         # keep the full JSON report
+
+Exits with status 1 when a scenario fails or regresses past its threshold.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from benchmarks.harness import (
+    DEFAULT_BASELINE,
+    DEFAULT_THRESHOLDS,
+    build_report,
+    compare,
+    configure_server,
+    format_report,
+    prepare_environment,
+    run_scenario,
+    thresholds_to_json,
+)
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.transport import DEFAULT_CASSETTE, BenchmarkTransport
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Offline tool call benchmarks")
+    parser.add_argument(
+        "-s", "--scenario", action="append", choices=sorted(SCENARIOS), help="Scenario to run (repeatable)"
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=20, help="Measured iterations per scenario")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured iterations before measuring")
+    parser.add_argument("--concurrency", type=int, default=4, help="Iterations in flight during the throughput pass")
+    parser.add_argument("--provider-latency-ms", type=float, default=0.0, help="Simulated upstream latency")
+    parser.add_argument(
+        "--cassette",
+        default=str(DEFAULT_CASSETTE),
+        help="Cassette whose responses are replayed ('none' for synthetic responses only)",
+    )
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run's results as the baseline")
+    parser.add_argument("--output", help="Also write the full JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    prepare_environment()
+    configure_server()
+
+    cassette = None if args.cassette.lower() == "none" else Path(args.cassette)
+    transport = BenchmarkTransport(cassette, latency=args.provider_latency_ms / 1000)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="zen-benchmarks-") as workspace_root:
+        for name in args.scenario or list(SCENARIOS):
+            print(f"Running {name}...", file=sys.stderr)
+            results[name] = run_scenario(
+                SCENARIOS[name],
+                Path(workspace_root) / name,
+                iterations=args.iterations,
+                warmup=args.warmup,
+                concurrency=args.concurrency,
+                transport=transport,
+            )
+    report = build_report(results)
+
+    baseline_path = Path(args.baseline)
+    regressions = None
+    if args.update_baseline:
+        # Keep hand-tuned thresholds; a new baseline starts from the defaults
+        previous = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+        report["thresholds"] = previous.get("thresholds") or thresholds_to_json(DEFAULT_THRESHOLDS)
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {baseline_path}", file=sys.stderr)
+    elif baseline_path.exists():
+        regressions = compare(report, json.loads(baseline_path.read_text(encoding="utf-8")))
+        report["regressions"] = regressions
+    else:
+        print(f"No baseline at {baseline_path}; run with --update-baseline to record one", file=sys.stderr)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(format_report(report, regressions))
+
+    failed = any(result["errors"] for result in results.values()) or bool(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
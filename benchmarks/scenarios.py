@@ -0,0 +1,209 @@
+"""
+Benchmark scenarios: end-to-end tool calls through ``server.handle_call_tool``
+
+Each scenario writes its workspace once (``setup``, which returns a factory for
+per-iteration inputs such as a fresh conversation thread), then every measured
+iteration runs one or more MCP tool calls (``run``).  The numbers cover argument
+validation, thread reconstruction, file reading, prompt assembly, the provider
+round trip (answered by :mod:`benchmarks.transport`) and response formatting.
+"""
+
+import json
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+BENCHMARK_MODEL = "gpt-5.4"
+
+# A module worth reviewing: long enough that file reading and line numbering show up
+_SAMPLE_SOURCE = '''"""Order processing service."""
+
+import logging
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Order:
+    order_id: str
+    amount: float
+    currency: str = "USD"
+
+
+class OrderService:
+    def __init__(self, repository, payments):
+        self.repository = repository
+        self.payments = payments
+
+    def place(self, order: Order) -> bool:
+        if order.amount <= 0:
+            raise ValueError("amount must be positive")
+        for attempt in range(3):
+            try:
+                self.payments.charge(order.order_id, order.amount, order.currency)
+                break
+            except Exception:
+                logger.warning("charge failed for %s (attempt %d)", order.order_id, attempt + 1)
+        else:
+            return False
+        self.repository.save(order)
+        return True
+'''
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    tool_calls: int
+    setup: Callable[[Path], Callable[[], Any]]
+    run: Callable[[Any], Awaitable[list]]
+
+
+def write_workspace(root: Path, files: int = 4) -> list[str]:
+    """Create ``files`` sample modules under ``root`` and return their absolute paths."""
+    root.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(files):
+        path = root / f"orders_{index}.py"
+        path.write_text(_SAMPLE_SOURCE * (index + 1), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+async def _call(name: str, arguments: dict[str, Any]) -> list:
+    import server
+
+    return await server.handle_call_tool(name, arguments)
+
+
+def _chat_arguments(workspace: Path, files: list[str], prompt: str) -> dict[str, Any]:
+    return {
+        "prompt": prompt,
+        "model": BENCHMARK_MODEL,
+        "working_directory": str(workspace),
+        "files": files,
+    }
+
+
+# -- chat -------------------------------------------------------------------
+
+
+def _setup_chat(workspace: Path):
+    arguments = _chat_arguments(workspace, write_workspace(workspace), "Review the retry handling in these modules.")
+    return lambda: dict(arguments)
+
+
+async def _run_chat(arguments) -> list:
+    return [await _call("chat", arguments)]
+
+
+# -- consensus --------------------------------------------------------------
+
+
+def _setup_consensus(workspace: Path):
+    arguments = {
+        "step": "Should the order service retry payment charges inside the request, or hand them to a queue?",
+        "step_number": 1,
+        "total_steps": 2,
+        "next_step_required": True,
+        "findings": "Charges are retried three times inline; failures are only logged.",
+        "models": [
+            {"model": BENCHMARK_MODEL, "stance": "for"},
+            {"model": BENCHMARK_MODEL, "stance": "against"},
+        ],
+        "relevant_files": write_workspace(workspace, files=2),
+    }
+    return lambda: dict(arguments)
+
+
+async def _run_consensus(arguments) -> list:
+    first = await _call("consensus", arguments)
+    data = json.loads(first[0].text)
+    continuation = data.get("continuation_offer") or {}
+    second = await _call(
+        "consensus",
+        {
+            "step": "Recorded the supporting view; consult the opposing stance.",
+            "step_number": 2,
+            "total_steps": 2,
+            "next_step_required": False,
+            "findings": "First model favours inline retries with a tighter budget.",
+            "continuation_id": continuation.get("continuation_id"),
+            "current_model_index": data.get("current_model_index", 1),
+            "model_responses": data.get("model_responses", []),
+        },
+    )
+    return [first, second]
+
+
+# -- codereview expert step -------------------------------------------------
+
+
+def _setup_codereview(workspace: Path):
+    files = write_workspace(workspace)
+    arguments = {
+        "step": "Reviewed the order service for correctness and error handling.",
+        "step_number": 1,
+        "total_steps": 1,
+        "next_step_required": False,
+        "findings": "Payment retries swallow every exception and the final failure is not surfaced to callers.",
+        "relevant_files": files,
+        "files_checked": files,
+        "issues_found": [{"severity": "medium", "description": "Retries catch all exceptions"}],
+        "confidence": "high",
+        "model": BENCHMARK_MODEL,
+    }
+    return lambda: dict(arguments)
+
+
+async def _run_codereview(arguments) -> list:
+    return [await _call("codereview", arguments)]
+
+
+# -- continuation -----------------------------------------------------------
+
+
+def _continuation_setup(turns: int):
+    def setup(workspace: Path):
+        files = write_workspace(workspace)
+        return lambda: _thread_arguments(workspace, files, turns)
+
+    return setup
+
+
+def _thread_arguments(workspace: Path, files: list[str], turns: int) -> dict[str, Any]:
+    """Chat arguments continuing a new ``turns``-turn thread (each call adds turns, so threads are not reused)."""
+    from utils.conversation_memory import add_turn, create_thread
+
+    thread_id = create_thread("chat", {"prompt": "Review the order service", "model": BENCHMARK_MODEL})
+    for index in range(turns):
+        role = "user" if index % 2 == 0 else "assistant"
+        add_turn(
+            thread_id,
+            role,
+            f"Turn {index + 1}: " + _SAMPLE_SOURCE[: 400 + 40 * (index % 10)],
+            files=[files[index % len(files)]] if role == "user" else None,
+            tool_name="chat",
+            model_provider="openai" if role == "assistant" else None,
+            model_name=BENCHMARK_MODEL if role == "assistant" else None,
+        )
+    arguments = _chat_arguments(workspace, [], "Given everything so far, what should we fix first?")
+    arguments["continuation_id"] = thread_id
+    return arguments
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("chat", "chat with four files", 1, _setup_chat, _run_chat),
+        Scenario("consensus", "two-model consensus (both steps)", 2, _setup_consensus, _run_consensus),
+        Scenario(
+            "codereview_expert", "final codereview step with expert analysis", 1, _setup_codereview, _run_codereview
+        ),
+        Scenario("continuation_10", "chat continuing a 10-turn thread", 1, _continuation_setup(10), _run_chat),
+        Scenario("continuation_50", "chat continuing a 50-turn thread", 1, _continuation_setup(50), _run_chat),
+    )
+}
@@ -0,0 +1,139 @@
+"""
+Offline provider responses for benchmarks
+
+:class:`BenchmarkTransport` stands in for the OpenAI HTTP endpoint.  Requests
+that match a cassette interaction exactly are replayed as recorded (the same
+matching ``tests/http_transport_recorder.py`` uses in the test suite).
+Benchmark prompts rarely match a recording byte for byte, so other requests
+to a recorded endpoint get the first recorded response for that endpoint,
+and endpoints without a recording get a synthetic response of a fixed size.
+Nothing leaves the process.
+"""
+
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from tests.http_transport_recorder import ReplayTransport
+
+DEFAULT_CASSETTE = (
+    Path(__file__).resolve().parent.parent / "tests" / "openai_cassettes" / "chat_cross_step2_gpt5_reminder.json"
+)
+
+# Roughly the size of a typical chat answer, so response parsing costs something
+SYNTHETIC_CONTENT = (
+    "The change looks sound. The main risk is the retry loop in the client: it retries on every exception, "
+    "including validation errors that will never succeed, which multiplies latency under load. Restrict retries "
+    "to transient network failures and surface the rest immediately. Consider adding a test that exercises the "
+    "timeout path.\n"
+) * 4
+
+
+class BenchmarkTransport(ReplayTransport):
+    """Replay a cassette where possible, otherwise answer with recorded or synthetic responses.
+
+    ``served`` counts how each request was answered (``exact``, ``replayed`` or ``synthetic``),
+    and ``latency`` (seconds) simulates upstream time on every request.
+    """
+
+    def __init__(self, cassette_path: Optional[Path] = DEFAULT_CASSETTE, latency: float = 0.0):
+        self.latency = latency
+        self.served: Counter = Counter()
+        if cassette_path is not None and Path(cassette_path).exists():
+            super().__init__(str(cassette_path))
+        else:
+            self.cassette_path = None
+            self.interactions = []
+            httpx.MockTransport.__init__(self, self._handle_request)
+
+    def _handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.latency:
+            time.sleep(self.latency)
+        if ReplayTransport._find_matching_interaction(self, request) is not None:
+            self.served["exact"] += 1
+            return super()._handle_request(request)
+        if self._interactions_for_path(request.url.path):
+            self.served["replayed"] += 1
+            return super()._handle_request(request)
+        self.served["synthetic"] += 1
+        return httpx.Response(200, json=synthetic_response(request), request=request)
+
+    def _find_matching_interaction(self, request: httpx.Request):
+        interaction = super()._find_matching_interaction(request)
+        if interaction is not None:
+            return interaction
+        candidates = self._interactions_for_path(request.url.path)
+        return candidates[0] if candidates else None
+
+    def _interactions_for_path(self, path: str) -> list:
+        return [
+            interaction
+            for interaction in self.interactions
+            if httpx.URL(interaction["request"].get("url", "")).path == path
+        ]
+
+
+def synthetic_response(request: httpx.Request) -> dict:
+    """A minimal successful Chat Completions or Responses API body for ``request``."""
+    try:
+        model = json.loads(request.content or b"{}").get("model", "gpt-5.4")
+    except ValueError:
+        model = "gpt-5.4"
+    usage = {"prompt_tokens": 1200, "completion_tokens": 180, "total_tokens": 1380}
+    if request.url.path.endswith("/responses"):
+        return {
+            "id": "resp_benchmark",
+            "object": "response",
+            "created_at": 0,
+            "model": model,
+            "status": "completed",
+            "output": [
+                {
+                    "type": "message",
+                    "id": "msg_benchmark",
+                    "role": "assistant",
+                    "status": "completed",
+                    "content": [{"type": "output_text", "text": SYNTHETIC_CONTENT, "annotations": []}],
+                }
+            ],
+            "output_text": SYNTHETIC_CONTENT,
+            "usage": {"input_tokens": 1200, "output_tokens": 180, "total_tokens": 1380},
+        }
+    return {
+        "id": "chatcmpl-benchmark",
+        "object": "chat.completion",
+        "created": 0,
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": SYNTHETIC_CONTENT, "refusal": None},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": usage,
+    }
+
+
+@contextmanager
+def use_transport(transport: httpx.BaseTransport):
+    """Route every OpenAI-compatible provider client created inside the block through ``transport``.
+
+    Uses the ``_test_transport`` hook that ``OpenAICompatibleProvider.client`` checks when it
+    builds its HTTP client; cached provider instances are dropped on the way in and out.
+    """
+    from providers.openai_compatible import OpenAICompatibleProvider
+    from providers.registry import ModelProviderRegistry
+
+    ModelProviderRegistry.clear_cache()
+    OpenAICompatibleProvider._test_transport = transport
+    try:
+        yield transport
+    finally:
+        del OpenAICompatibleProvider._test_transport
+        ModelProviderRegistry.clear_cache()
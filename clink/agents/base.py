@@ -7,6 +7,7 @@ import logging
 import os
 import shlex
 import shutil
+import signal
 import tempfile
 import time
 from collections.abc import Sequence
@@ -116,6 +117,8 @@ class BaseCLIAgent:
                 cwd=cwd,
                 limit=limit,
                 env=env,
+                # Own process group, so the CLI and any helpers it spawns can be killed together
+                start_new_session=os.name == "posix",
             )
         except FileNotFoundError as exc:
             raise CLIAgentError(f"Executable not found for CLI '{self.client.name}': {exc}") from exc
@@ -126,12 +129,24 @@ class BaseCLIAgent:
                 timeout=self.client.timeout_seconds,
             )
         except asyncio.TimeoutError as exc:
-            process.kill()
+            self._kill_process_group(process)
             await process.communicate()
             raise CLIAgentError(
                 f"CLI '{self.client.name}' timed out after {self.client.timeout_seconds} seconds",
                 returncode=None,
             ) from exc
+        except asyncio.CancelledError:
+            # The MCP request was cancelled or the client went away: nobody will read the answer
+            self._logger.info("Request cancelled; killing CLI '%s' (pid %s)", self.client.name, process.pid)
+            self._kill_process_group(process)
+            try:
+                # Reap the killed CLI even if this task is cancelled again, so it doesn't linger as a zombie
+                await asyncio.shield(process.wait())
+            except asyncio.CancelledError:
+                pass
+            if output_file_path and self.client.output_to_file and self.client.output_to_file.cleanup:
+                output_file_path.unlink(missing_ok=True)
+            raise
 
         duration = time.monotonic() - start_time
         return_code = process.returncode
@@ -190,6 +205,19 @@ class BaseCLIAgent:
             output_file_content=output_file_content,
         )
 
+    @staticmethod
+    def _kill_process_group(process: asyncio.subprocess.Process) -> None:
+        """Kill the CLI process and everything it started."""
+        if process.returncode is not None:
+            return
+        try:
+            if os.name == "posix":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
     def _build_command(self, *, role: ResolvedCLIRole, system_prompt: str | None) -> list[str]:
         base = list(self.client.executable)
         base.extend(self.client.internal_args)